@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-14 05:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(fields=['owner', '-created_at'], name='todo_todo_owner_i_151a5f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(fields=['owner', 'status'], name='todo_todo_owner_i_083cc8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(fields=['owner', 'priority'], name='todo_todo_owner_i_1b8216_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(condition=models.Q(('status', 'completed'), _negated=True), fields=['owner', 'due_date'], name='todo_active_due_idx'),
+        ),
+    ]
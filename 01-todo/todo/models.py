@@ -1,23 +1,73 @@
 from django.db import models
+from django.db.models import BooleanField, Case, CharField, ExpressionWrapper, F, Q, Value, When
+from django.db.models.functions import Now
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 # Create your models here.
 
+STATUS_CHOICES = [
+    ('pending', 'Pending'),
+    ('in_progress', 'In Progress'),
+    ('completed', 'Completed'),
+]
+
+PRIORITY_CHOICES = [
+    ('low', 'Low'),
+    ('medium', 'Medium'),
+    ('high', 'High'),
+]
+
+# Plain dict lookup for labels, cheaper than get_status_display() per row
+STATUS_DISPLAY = dict(STATUS_CHOICES)
+
+
+def overdue_q():
+    """Return the condition matching overdue TODOs, evaluated by the database."""
+    return Q(due_date__isnull=False, due_date__lt=Now()) & ~Q(status='completed')
+
+
+class TodoQuerySet(models.QuerySet):
+    """
+    QuerySet with helpers for common TODO queries.
+    """
+    
+    def for_user(self, user):
+        """Return the TODOs owned by ``user``, with the owner joined in."""
+        return self.filter(owner=user).select_related('owner')
+    
+    def with_overdue(self):
+        """Annotate each TODO with ``is_overdue_db``, computed by the database."""
+        return self.annotate(
+            is_overdue_db=ExpressionWrapper(
+                overdue_q(),
+                output_field=BooleanField()
+            )
+        )
+    
+    def with_display(self):
+        """Annotate each TODO with ``status_display`` and ``priority_display`` labels."""
+        return self.annotate(
+            status_display=_choice_label('status', self.model.STATUS_CHOICES),
+            priority_display=_choice_label('priority', self.model.PRIORITY_CHOICES),
+        )
+
+
+def _choice_label(field, choices):
+    """Build a database expression mapping a choice field's value to its label."""
+    return Case(
+        *[When(**{field: value}, then=Value(label)) for value, label in choices],
+        default=F(field),
+        output_field=CharField()
+    )
+
+
 class Todo(models.Model):
     """
     Model representing a TODO item.
     """
-    STATUS_CHOICES = [
-        ('pending', 'Pending'),
-        ('in_progress', 'In Progress'),
-        ('completed', 'Completed'),
-    ]
-    
-    PRIORITY_CHOICES = [
-        ('low', 'Low'),
-        ('medium', 'Medium'),
-        ('high', 'High'),
-    ]
+    STATUS_CHOICES = STATUS_CHOICES
+    PRIORITY_CHOICES = PRIORITY_CHOICES
     
     title = models.CharField(max_length=200, help_text="Title of the TODO item")
     description = models.TextField(blank=True, help_text="Detailed description of the TODO")
@@ -44,24 +94,40 @@ class Todo(models.Model):
         help_text="User who owns this TODO"
     )
     
+    objects = TodoQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['owner', '-created_at']),
+            models.Index(fields=['owner', 'status']),
+            models.Index(fields=['owner', 'priority']),
+            models.Index(
+                fields=['owner', 'due_date'],
+                condition=~Q(status='completed'),
+                name='todo_active_due_idx'
+            ),
+        ]
         verbose_name = 'TODO'
         verbose_name_plural = 'TODOs'
     
     def __str__(self):
-        return f"{self.title} ({self.get_status_display()})"
+        return f"{self.title} ({STATUS_DISPLAY.get(self.status, self.status)})"
     
     def mark_as_completed(self):
         """Mark the TODO as completed and set the completion timestamp."""
-        from django.utils import timezone
         self.status = 'completed'
         self.completed_at = timezone.now()
-        self.save()
+        self.save(update_fields=['status', 'completed_at', 'updated_at'])
     
-    def is_overdue(self):
-        """Check if the TODO is overdue."""
-        from django.utils import timezone
+    def is_overdue(self, now=None):
+        """
+        Check if the TODO is overdue.
+        
+        Pass ``now`` when checking many TODOs to reuse a single timestamp.
+        """
         if self.due_date and self.status != 'completed':
-            return timezone.now() > self.due_date
+            if now is None:
+                now = timezone.now()
+            return now > self.due_date
         return False
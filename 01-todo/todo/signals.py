@@ -0,0 +1,16 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Todo
+
+
+def stats_cache_key(user_id):
+    """Return the cache key holding the TODO statistics for a user."""
+    return f'todo_stats:{user_id}'
+
+
+@receiver(post_save, sender=Todo)
+@receiver(post_delete, sender=Todo)
+def invalidate_todo_stats(sender, instance, **kwargs):
+    """Drop the owner's cached statistics whenever one of their TODOs changes."""
+    cache.delete(stats_cache_key(instance.owner_id))
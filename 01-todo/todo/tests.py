@@ -1,5 +1,8 @@
-from django.test import TestCase, Client
+from django.test import SimpleTestCase, TestCase, Client
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from datetime import timedelta
@@ -9,17 +12,18 @@ from .models import Todo
 class TodoModelTest(TestCase):
     """Test cases for the Todo model."""
     
-    def setUp(self):
-        """Set up test data."""
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.user = User.objects.create_user(
             username='testuser',
             password='testpass123'
         )
-        self.todo = Todo.objects.create(
+        cls.todo = Todo.objects.create(
             title='Test TODO',
             description='Test description',
             priority='high',
-            owner=self.user
+            owner=cls.user
         )
     
     def test_todo_creation(self):
@@ -32,11 +36,6 @@ class TodoModelTest(TestCase):
         self.assertIsNotNone(self.todo.created_at)
         self.assertIsNotNone(self.todo.updated_at)
     
-    def test_todo_string_representation(self):
-        """Test the string representation of TODO."""
-        expected = f"{self.todo.title} (Pending)"
-        self.assertEqual(str(self.todo), expected)
-    
     def test_todo_default_values(self):
         """Test that default values are set correctly."""
         todo = Todo.objects.create(
@@ -54,6 +53,15 @@ class TodoModelTest(TestCase):
         self.assertEqual(self.todo.status, 'completed')
         self.assertIsNotNone(self.todo.completed_at)
     
+    def test_mark_as_completed_only_writes_status_fields(self):
+        """Test that mark_as_completed leaves unrelated columns untouched."""
+        Todo.objects.filter(pk=self.todo.pk).update(title='Changed elsewhere')
+        self.todo.mark_as_completed()
+        self.todo.refresh_from_db()
+        self.assertEqual(self.todo.title, 'Changed elsewhere')
+        self.assertEqual(self.todo.status, 'completed')
+        self.assertIsNotNone(self.todo.completed_at)
+    
     def test_is_overdue_with_past_due_date(self):
         """Test is_overdue returns True for past due dates."""
         past_date = timezone.now() - timedelta(days=1)
@@ -75,37 +83,77 @@ class TodoModelTest(TestCase):
         self.todo.mark_as_completed()
         self.assertFalse(self.todo.is_overdue())
     
+    def test_is_overdue_with_given_now(self):
+        """Test is_overdue compares against the supplied timestamp."""
+        due_date = timezone.now()
+        self.todo.due_date = due_date
+        self.assertTrue(self.todo.is_overdue(now=due_date + timedelta(hours=1)))
+        self.assertFalse(self.todo.is_overdue(now=due_date - timedelta(hours=1)))
+    
     def test_is_overdue_without_due_date(self):
         """Test is_overdue returns False when no due date is set."""
         self.assertFalse(self.todo.is_overdue())
+    
+    def test_with_overdue_annotation(self):
+        """Test with_overdue annotates is_overdue_db consistently with is_overdue."""
+        past_date = timezone.now() - timedelta(days=1)
+        overdue, completed = Todo.objects.bulk_create([
+            Todo(title='Overdue TODO', due_date=past_date, owner=self.user),
+            Todo(title='Completed TODO', status='completed', due_date=past_date, owner=self.user),
+        ])
+        annotated = {todo.pk: todo for todo in Todo.objects.with_overdue()}
+        self.assertTrue(annotated[overdue.pk].is_overdue_db)
+        self.assertFalse(annotated[completed.pk].is_overdue_db)
+        self.assertFalse(annotated[self.todo.pk].is_overdue_db)
+
+
+class TodoStringTests(SimpleTestCase):
+    """Test cases for Todo behaviour that needs no database."""
+    
+    def test_todo_string_representation(self):
+        """Test the string representation of TODO."""
+        todo = Todo(title='Test TODO', status='pending')
+        self.assertEqual(str(todo), 'Test TODO (Pending)')
+    
+    def test_todo_string_representation_uses_status_label(self):
+        """Test the string representation shows the human-readable status."""
+        todo = Todo(title='Test TODO', status='in_progress')
+        self.assertEqual(str(todo), 'Test TODO (In Progress)')
 
 
 class TodoViewTest(TestCase):
     """Test cases for the Todo views."""
     
-    def setUp(self):
-        """Set up test data."""
-        self.client = Client()
-        self.user1 = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.user1 = User.objects.create_user(
             username='user1',
             password='pass123'
         )
-        self.user2 = User.objects.create_user(
+        cls.user2 = User.objects.create_user(
             username='user2',
             password='pass123'
         )
-        self.todo1 = Todo.objects.create(
-            title='User1 TODO',
-            description='Description 1',
-            priority='high',
-            owner=self.user1
-        )
-        self.todo2 = Todo.objects.create(
-            title='User2 TODO',
-            description='Description 2',
-            priority='low',
-            owner=self.user2
-        )
+        cls.todo1, cls.todo2 = Todo.objects.bulk_create([
+            Todo(
+                title='User1 TODO',
+                description='Description 1',
+                priority='high',
+                owner=cls.user1
+            ),
+            Todo(
+                title='User2 TODO',
+                description='Description 2',
+                priority='low',
+                owner=cls.user2
+            ),
+        ])
+    
+    def setUp(self):
+        """Reset per-test state."""
+        cache.clear()
+        self.client = Client()
     
     def test_todo_list_requires_authentication(self):
         """Test that todo_list view requires authentication."""
@@ -129,7 +177,36 @@ class TodoViewTest(TestCase):
         response = self.client.get(reverse('todo_list') + '?status=completed')
         self.assertEqual(response.status_code, 200)
         self.assertIn('todos', response.context)
-        self.assertEqual(response.context['todos'].count(), 1)
+        self.assertEqual(len(response.context['todos']), 1)
+    
+    def test_todo_list_fetches_todos_in_one_query(self):
+        """Test that todo_list loads its rows with a single query."""
+        self.client.login(username='user1', password='pass123')
+        with self.assertNumQueries(3):  # session, user, todo rows
+            response = self.client.get(reverse('todo_list'))
+        self.assertIsInstance(response.context['todos'], list)
+    
+    def test_todo_list_does_not_select_description(self):
+        """Test that todo_list leaves the description column out of its query."""
+        self.client.login(username='user1', password='pass123')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('todo_list'))
+        todo_queries = [q['sql'] for q in queries if Todo._meta.db_table in q['sql']]
+        self.assertEqual(len(todo_queries), 1)
+        self.assertNotIn('description', todo_queries[0])
+    
+    def test_todo_list_renders_values_rows(self):
+        """Test that todo_list passes dict rows with display labels to the template."""
+        self.client.login(username='user1', password='pass123')
+        response = self.client.get(reverse('todo_list'))
+        row = response.context['todos'][0]
+        self.assertIsInstance(row, dict)
+        self.assertEqual(row['pk'], self.todo1.pk)
+        self.assertEqual(row['status_display'], 'Pending')
+        self.assertEqual(row['priority_display'], 'High')
+        self.assertFalse(row['is_overdue_db'])
+        self.assertContains(response, 'Pending')
+        self.assertContains(response, 'High')
     
     def test_todo_detail_view(self):
         """Test the todo_detail view."""
@@ -162,6 +239,55 @@ class TodoViewTest(TestCase):
         self.assertEqual(response.status_code, 302)  # Redirect after success
         self.assertTrue(Todo.objects.filter(title='New TODO').exists())
     
+    def test_todo_create_post_with_invalid_priority(self):
+        """Test that an unknown priority falls back to medium."""
+        self.client.login(username='user1', password='pass123')
+        data = {
+            'title': 'Odd Priority TODO',
+            'priority': 'urgent',
+        }
+        self.client.post(reverse('todo_create'), data)
+        todo = Todo.objects.get(title='Odd Priority TODO')
+        self.assertEqual(todo.priority, 'medium')
+    
+    def test_todo_create_post_with_due_date(self):
+        """Test that a submitted due date is stored as an aware datetime."""
+        self.client.login(username='user1', password='pass123')
+        data = {
+            'title': 'Dated TODO',
+            'priority': 'medium',
+            'due_date': '2030-01-15T09:30',
+        }
+        response = self.client.post(reverse('todo_create'), data)
+        self.assertEqual(response.status_code, 302)
+        todo = Todo.objects.get(title='Dated TODO')
+        self.assertTrue(timezone.is_aware(todo.due_date))
+        self.assertEqual(timezone.localtime(todo.due_date).hour, 9)
+    
+    def test_todo_create_post_with_invalid_due_date(self):
+        """Test that an unparseable due date is rejected without saving."""
+        self.client.login(username='user1', password='pass123')
+        data = {
+            'title': 'Bad Date TODO',
+            'priority': 'medium',
+            'due_date': 'next tuesday',
+        }
+        response = self.client.post(reverse('todo_create'), data)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Todo.objects.filter(title='Bad Date TODO').exists())
+    
+    def test_todo_create_post_without_title_reports_title_first(self):
+        """Test that a missing title is reported before an invalid due date."""
+        self.client.login(username='user1', password='pass123')
+        data = {
+            'description': 'No title, bad date',
+            'due_date': 'next tuesday',
+        }
+        response = self.client.post(reverse('todo_create'), data)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Title is required!')
+        self.assertFalse(Todo.objects.filter(description='No title, bad date').exists())
+    
     def test_todo_create_post_without_title(self):
         """Test that creating TODO without title fails."""
         self.client.login(username='user1', password='pass123')
@@ -169,10 +295,10 @@ class TodoViewTest(TestCase):
             'description': 'No title',
             'priority': 'low',
         }
-        initial_count = Todo.objects.count()
         response = self.client.post(reverse('todo_create'), data)
         # Should stay on the same page with error
-        self.assertEqual(Todo.objects.count(), initial_count)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Todo.objects.filter(description='No title').exists())
     
     def test_todo_update_view(self):
         """Test updating a TODO."""
@@ -183,6 +309,7 @@ class TodoViewTest(TestCase):
             'status': 'in_progress',
             'priority': 'high',
         }
+        before = self.todo1.updated_at
         response = self.client.post(
             reverse('todo_update', args=[self.todo1.pk]),
             data
@@ -191,6 +318,36 @@ class TodoViewTest(TestCase):
         self.todo1.refresh_from_db()
         self.assertEqual(self.todo1.title, 'Updated TODO')
         self.assertEqual(self.todo1.status, 'in_progress')
+        self.assertGreater(self.todo1.updated_at, before)
+    
+    def test_todo_update_view_ignores_invalid_choices(self):
+        """Test that unknown status and priority values keep the current ones."""
+        self.client.login(username='user1', password='pass123')
+        data = {
+            'title': 'Updated TODO',
+            'status': 'archived',
+            'priority': 'urgent',
+        }
+        self.client.post(reverse('todo_update', args=[self.todo1.pk]), data)
+        self.todo1.refresh_from_db()
+        self.assertEqual(self.todo1.title, 'Updated TODO')
+        self.assertEqual(self.todo1.status, 'pending')
+        self.assertEqual(self.todo1.priority, 'high')
+    
+    def test_todo_update_view_with_invalid_due_date(self):
+        """Test that an invalid due date leaves the TODO unchanged."""
+        self.client.login(username='user1', password='pass123')
+        data = {
+            'title': 'Updated TODO',
+            'due_date': '2030-13-45T99:99',
+        }
+        response = self.client.post(
+            reverse('todo_update', args=[self.todo1.pk]),
+            data
+        )
+        self.assertEqual(response.status_code, 200)
+        self.todo1.refresh_from_db()
+        self.assertEqual(self.todo1.title, 'User1 TODO')
     
     def test_todo_delete_view(self):
         """Test deleting a TODO."""
@@ -213,16 +370,10 @@ class TodoViewTest(TestCase):
         """Test the statistics view."""
         self.client.login(username='user1', password='pass123')
         # Create more TODOs for stats
-        Todo.objects.create(
-            title='Completed TODO',
-            status='completed',
-            owner=self.user1
-        )
-        Todo.objects.create(
-            title='High Priority TODO',
-            priority='high',
-            owner=self.user1
-        )
+        Todo.objects.bulk_create([
+            Todo(title='Completed TODO', status='completed', owner=self.user1),
+            Todo(title='High Priority TODO', priority='high', owner=self.user1),
+        ])
         
         response = self.client.get(reverse('todo_stats'))
         self.assertEqual(response.status_code, 200)
@@ -231,3 +382,35 @@ class TodoViewTest(TestCase):
         self.assertGreaterEqual(stats['total'], 3)
         self.assertGreaterEqual(stats['completed'], 1)
         self.assertGreaterEqual(stats['high_priority'], 2)
+    
+    def test_todo_stats_view_counts_overdue_in_one_query(self):
+        """Test that stats are computed in a single query, including overdue."""
+        self.client.login(username='user1', password='pass123')
+        past_date = timezone.now() - timedelta(days=1)
+        Todo.objects.bulk_create([
+            Todo(title='Overdue TODO', due_date=past_date, owner=self.user1),
+            Todo(title='Done Late TODO', status='completed', due_date=past_date, owner=self.user1),
+        ])
+        
+        with self.assertNumQueries(3):  # session, user, stats aggregate
+            response = self.client.get(reverse('todo_stats'))
+        stats = response.context['stats']
+        self.assertEqual(stats['total'], 3)
+        self.assertEqual(stats['overdue'], 1)
+        self.assertEqual(stats['completed'], 1)
+    
+    def test_todo_stats_view_is_cached_until_todos_change(self):
+        """Test that stats are served from cache and refreshed after a save."""
+        self.client.login(username='user1', password='pass123')
+        self.client.get(reverse('todo_stats'))
+        with self.assertNumQueries(2):  # session, user
+            response = self.client.get(reverse('todo_stats'))
+        self.assertEqual(response.context['stats']['total'], 1)
+        
+        Todo.objects.create(title='Another TODO', owner=self.user1)
+        response = self.client.get(reverse('todo_stats'))
+        self.assertEqual(response.context['stats']['total'], 2)
+        
+        self.client.post(reverse('todo_delete', args=[self.todo1.pk]))
+        response = self.client.get(reverse('todo_stats'))
+        self.assertEqual(response.context['stats']['total'], 1)
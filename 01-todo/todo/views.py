@@ -1,8 +1,19 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.core.cache import cache
+from django.db.models import Count, Q
 from django.utils import timezone
-from .models import Todo
+from django.utils.dateparse import parse_datetime
+from .models import Todo, overdue_q
+from .signals import stats_cache_key
+
+# Seconds to keep a user's statistics cached; saves and deletes invalidate it sooner
+STATS_CACHE_TIMEOUT = 300
+
+# Accepted POST values for the choice fields; anything else falls back
+VALID_PRIORITIES = frozenset(dict(Todo.PRIORITY_CHOICES))
+VALID_STATUSES = frozenset(dict(Todo.STATUS_CHOICES))
 
 # Create your views here.
 
@@ -11,7 +22,7 @@ def todo_list(request):
     """
     View to display all TODO items for the logged-in user.
     """
-    todos = Todo.objects.filter(owner=request.user)
+    todos = Todo.objects.for_user(request.user).with_overdue()
     
     # Filter by status if provided
     status_filter = request.GET.get('status')
@@ -23,6 +34,12 @@ def todo_list(request):
     if priority_filter:
         todos = todos.filter(priority=priority_filter)
     
+    # Only fetch what the list template renders, as plain dicts, evaluated once
+    todos = list(todos.with_display().values(
+        'pk', 'title', 'status', 'priority', 'due_date', 'created_at',
+        'status_display', 'priority_display', 'is_overdue_db',
+    ))
+    
     context = {
         'todos': todos,
         'status_filter': status_filter,
@@ -36,7 +53,7 @@ def todo_detail(request, pk):
     """
     View to display a single TODO item.
     """
-    todo = get_object_or_404(Todo, pk=pk, owner=request.user)
+    todo = get_object_or_404(Todo.objects.for_user(request.user), pk=pk)
     context = {'todo': todo}
     return render(request, 'todo/todo_detail.html', context)
 
@@ -50,20 +67,29 @@ def todo_create(request):
         title = request.POST.get('title')
         description = request.POST.get('description', '')
         priority = request.POST.get('priority', 'medium')
-        due_date = request.POST.get('due_date')
+        priority = priority if priority in VALID_PRIORITIES else 'medium'
         
-        if title:
+        try:
+            due_date = _parse_due(request.POST.get('due_date'))
+            due_date_valid = True
+        except ValueError:
+            due_date = None
+            due_date_valid = False
+        
+        if not title:
+            messages.error(request, 'Title is required!')
+        elif not due_date_valid:
+            messages.error(request, 'Due date is not a valid date and time!')
+        else:
             todo = Todo.objects.create(
                 title=title,
                 description=description,
                 priority=priority,
-                due_date=due_date if due_date else None,
+                due_date=due_date,
                 owner=request.user
             )
             messages.success(request, f'TODO "{todo.title}" created successfully!')
             return redirect('todo_list')
-        else:
-            messages.error(request, 'Title is required!')
     
     return render(request, 'todo/todo_form.html', {'action': 'Create'})
 
@@ -73,19 +99,24 @@ def todo_update(request, pk):
     """
     View to update an existing TODO item.
     """
-    todo = get_object_or_404(Todo, pk=pk, owner=request.user)
+    todo = get_object_or_404(Todo.objects.for_user(request.user), pk=pk)
     
     if request.method == 'POST':
         todo.title = request.POST.get('title', todo.title)
         todo.description = request.POST.get('description', todo.description)
-        todo.status = request.POST.get('status', todo.status)
-        todo.priority = request.POST.get('priority', todo.priority)
-        due_date = request.POST.get('due_date')
-        todo.due_date = due_date if due_date else None
+        status = request.POST.get('status')
+        todo.status = status if status in VALID_STATUSES else todo.status
+        priority = request.POST.get('priority')
+        todo.priority = priority if priority in VALID_PRIORITIES else todo.priority
         
-        todo.save()
-        messages.success(request, f'TODO "{todo.title}" updated successfully!')
-        return redirect('todo_detail', pk=todo.pk)
+        try:
+            todo.due_date = _parse_due(request.POST.get('due_date'))
+        except ValueError:
+            messages.error(request, 'Due date is not a valid date and time!')
+        else:
+            todo.save(update_fields=['title', 'description', 'status', 'priority', 'due_date', 'updated_at'])
+            messages.success(request, f'TODO "{todo.title}" updated successfully!')
+            return redirect('todo_detail', pk=todo.pk)
     
     context = {
         'todo': todo,
@@ -99,7 +130,7 @@ def todo_delete(request, pk):
     """
     View to delete a TODO item.
     """
-    todo = get_object_or_404(Todo, pk=pk, owner=request.user)
+    todo = get_object_or_404(Todo.objects.for_user(request.user), pk=pk)
     
     if request.method == 'POST':
         title = todo.title
@@ -116,7 +147,7 @@ def todo_complete(request, pk):
     """
     View to mark a TODO as completed.
     """
-    todo = get_object_or_404(Todo, pk=pk, owner=request.user)
+    todo = get_object_or_404(Todo.objects.for_user(request.user), pk=pk)
     todo.mark_as_completed()
     messages.success(request, f'TODO "{todo.title}" marked as completed!')
     return redirect('todo_list')
@@ -127,16 +158,41 @@ def todo_stats(request):
     """
     View to display statistics about the user's TODOs.
     """
-    todos = Todo.objects.filter(owner=request.user)
-    
-    stats = {
-        'total': todos.count(),
-        'pending': todos.filter(status='pending').count(),
-        'in_progress': todos.filter(status='in_progress').count(),
-        'completed': todos.filter(status='completed').count(),
-        'overdue': sum(1 for todo in todos if todo.is_overdue()),
-        'high_priority': todos.filter(priority='high').count(),
-    }
+    stats = cache.get_or_set(
+        stats_cache_key(request.user.id),
+        lambda: _compute_stats(request.user),
+        timeout=STATS_CACHE_TIMEOUT
+    )
     
     context = {'stats': stats}
     return render(request, 'todo/todo_stats.html', context)
+
+
+def _compute_stats(user):
+    """
+    Compute all counters for the statistics page in a single query.
+    """
+    return Todo.objects.for_user(user).aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status='pending')),
+        in_progress=Count('id', filter=Q(status='in_progress')),
+        completed=Count('id', filter=Q(status='completed')),
+        overdue=Count('id', filter=overdue_q()),
+        high_priority=Count('id', filter=Q(priority='high')),
+    )
+
+
+def _parse_due(value):
+    """
+    Parse a submitted due date into an aware datetime, or None when empty.
+    
+    Raises ValueError if the value is not a valid date and time.
+    """
+    if not value:
+        return None
+    due_date = parse_datetime(value)
+    if due_date is None:
+        raise ValueError(f'Invalid due date: {value!r}')
+    if timezone.is_naive(due_date):
+        due_date = timezone.make_aware(due_date)
+    return due_date